@@ -1,20 +1,27 @@
 # server.py
 import uuid
 import threading
+import multiprocessing
 import traceback
-from typing import Dict, Optional
+import sqlite3
+import time
+import gzip
+import shutil
+import glob
+from typing import Any, Dict, List, Literal, Optional, Tuple
 import os
-import json
-from fastapi import FastAPI, BackgroundTasks, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+import ijson
+import orjson
+import aiofiles
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from pathlib import Path
 import logging
+from contextlib import asynccontextmanager
 
-# Import your unchanged class
-from scraper import CFETariffScraperSimplified  # <-- your file name if different, adjust the import
-
-app = FastAPI(title="CFE Tariff Scraper Service")
+# Scrapes run in a separate process so Selenium work never competes with request handlers for the GIL
+from scraper import pid_alive, run_scrape  # <-- your file name if different, adjust the import
 
 # Basic logging to file and console
 LOG_DIR = Path("./logs")
@@ -29,9 +36,83 @@ logging.basicConfig(
 )
 logger = logging.getLogger("cfe_api")
 
+# Job state lives in SQLite so it survives restarts and is shared across uvicorn workers
+DB_URL = os.environ.get("DB_URL", f"sqlite:///{os.environ.get('OUTPUT_DIR', '/app/data')}/cfe.db")
+if not DB_URL.startswith("sqlite:///"):
+    raise RuntimeError(f"Unsupported DB_URL {DB_URL!r}: only sqlite:/// URLs are supported")
+DB_PATH = DB_URL[len("sqlite:///"):]
+
+# Statements are kept as constants and run on one connection per thread, so sqlite3's
+# per-connection statement cache prepares each of them once instead of on every request
+_INSERT_RUN_SQL = (
+    "INSERT INTO runs (id, status, message, output_dir, headless, created_at, owner_pid) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_START_RUN_SQL = "UPDATE runs SET status = ?, message = ?, started_at = ? WHERE id = ?"
+_FINISH_RUN_SQL = "UPDATE runs SET status = ?, message = ?, finished_at = ? WHERE id = ?"
+_SELECT_RUN_SQL = "SELECT * FROM runs WHERE id = ?"
+_LIST_RUNS_SQL = "SELECT id, status, output_dir, message FROM runs ORDER BY created_at"
+_OPEN_RUNS_SQL = "SELECT id, owner_pid FROM runs WHERE status IN ('pending', 'running')"
+_INTERRUPT_RUN_SQL = "UPDATE runs SET status = 'failed', message = ?, finished_at = ? WHERE id = ?"
+
+_DB_LOCAL = threading.local()
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_DB_LOCAL, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, timeout=30)
+        conn.row_factory = sqlite3.Row
+        _DB_LOCAL.conn = conn
+    return conn
+
+def _init_db():
+    Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+    conn = _connect()
+    with conn:
+        # WAL lets status reads proceed while another worker is writing
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS runs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                message TEXT,
+                output_dir TEXT NOT NULL,
+                headless INTEGER NOT NULL,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                owner_pid INTEGER
+            )"""
+        )
+        # Jobs are supervised by a thread of the worker that started them, so an open job whose
+        # worker is gone will never finish. This worker has none yet, so a row carrying its pid
+        # is left over from an earlier process that had the same pid
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        orphans = [
+            row["id"] for row in conn.execute(_OPEN_RUNS_SQL)
+            if row["owner_pid"] == os.getpid() or not pid_alive(row["owner_pid"])
+        ]
+        conn.executemany(
+            _INTERRUPT_RUN_SQL,
+            [("Interrupted: the API worker running it stopped before the scrape finished.", now, job_id) for job_id in orphans],
+        )
+    if orphans:
+        logger.warning(f"Marked {len(orphans)} job(s) left unfinished by a stopped worker as failed")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _init_db()
+    yield
+
+app = FastAPI(title="CFE Tariff Scraper Service", lifespan=lifespan)
+
+# "spawn" avoids forking a process that already has uvicorn's threads running
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
 class StartJobRequest(BaseModel):
     output_dir: str = Field(default="/app/data", description="Directory to store outputs")
     headless: bool = Field(True, description="Run Chrome headless on server")
+    workers: int = Field(1, ge=1, le=8, description="Parallel Chrome processes, each scraping a share of the fare types and regions")
     # Optional: allow limiting fare types later without changing scraper structure.
     # We won’t use it here since you asked not to change code logic.
 
@@ -41,31 +122,180 @@ class JobStatus(BaseModel):
     message: Optional[str] = None
     output_dir: Optional[str] = None
 
+# Declared response models let FastAPI serialize straight to JSON bytes through Pydantic
+class FailuresResponse(BaseModel):
+    failures: List[Dict[str, Any]]
+    total: int
+
+class JobList(BaseModel):
+    jobs: List[JobStatus]
+
 class _Job:
-    def __init__(self, job_id: str, output_dir: str, headless: bool):
+    def __init__(self, job_id: str, output_dir: str, headless: bool, workers: int = 1):
         self.job_id = job_id
         self.output_dir = output_dir
         self.headless = headless
+        self.workers = workers
         self.status = "pending"
         self.message: Optional[str] = None
+        self.created_at = time.strftime("%Y-%m-%d %H:%M:%S")
         self._thread: Optional[threading.Thread] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    def save(self):
+        """Insert the job into the runs table"""
+        conn = _connect()
+        with conn:
+            conn.execute(
+                _INSERT_RUN_SQL,
+                (self.job_id, self.status, self.message, self.output_dir, int(self.headless), self.created_at, os.getpid()),
+            )
+
+    def _transition(self, sql: str, status: str, message: Optional[str]):
+        """Record a status change with a single UPDATE"""
+        self.status = status
+        self.message = message
+        conn = _connect()
+        with conn:
+            conn.execute(sql, (status, message, time.strftime("%Y-%m-%d %H:%M:%S"), self.job_id))
 
     def run(self):
         try:
-            self.status = "running"
-            logger.info(f"[{self.job_id}] Starting scrape to {self.output_dir} (headless={self.headless})")
-            scraper = CFETariffScraperSimplified(self.output_dir, headless=self.headless)
-            scraper.scrape_all_data()
-            self.status = "finished"
-            self.message = "Scrape completed."
+            self._transition(_START_RUN_SQL, "running", None)
+            logger.info(f"[{self.job_id}] Starting scrape to {self.output_dir} (headless={self.headless}, workers={self.workers})")
+            # The child sends its exception text back, since its traceback only reaches its own stderr
+            error_recv, error_send = _MP_CONTEXT.Pipe(duplex=False)
+            proc = _MP_CONTEXT.Process(
+                target=run_scrape,
+                args=(self.output_dir, self.headless, self.workers, error_send),
+                name=f"scrape-{self.job_id}",
+            )
+            self._process = proc
+            proc.start()
+            error_send.close()
+            proc.join()
+            error = error_recv.recv() if error_recv.poll() else None
+            error_recv.close()
+            if proc.exitcode != 0:
+                raise RuntimeError(error or f"scraper process exited with code {proc.exitcode}")
+            self._transition(_FINISH_RUN_SQL, "finished", "Scrape completed.")
             logger.info(f"[{self.job_id}] Completed.")
         except Exception as e:
-            self.status = "failed"
-            self.message = f"Error: {e}"
+            self._transition(_FINISH_RUN_SQL, "failed", f"Error: {e}")
             logger.error(f"[{self.job_id}] Failed with error: {e}\n{traceback.format_exc()}")
 
-# In-memory job store (simple & effective for one box)
-_JOBS: Dict[str, _Job] = {}
+def _get_run(job_id: str) -> Optional[sqlite3.Row]:
+    return _connect().execute(_SELECT_RUN_SQL, (job_id,)).fetchone()
+
+# Record counts keyed by path -> (mtime, size, count); recounted only when the file changes.
+# The lock only guards the dict, so a long recount never holds up polls for other files
+_COUNT_CACHE: Dict[str, Tuple[float, int, int]] = {}
+_COUNT_LOCK = threading.Lock()
+
+def _count_json_records(path: str) -> int:
+    """Count top-level items of a JSON array, or lines of a JSONL store, without loading it into memory"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        with _COUNT_LOCK:
+            _COUNT_CACHE.pop(path, None)
+        return 0
+    with _COUNT_LOCK:
+        cached = _COUNT_CACHE.get(path)
+    if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+        return cached[2]
+    
+    try:
+        with open(path, 'rb') as f:
+            if path.endswith(".jsonl"):
+                count = sum(1 for line in f if line.strip())
+            else:
+                count = sum(1 for _ in ijson.items(f, 'item'))
+    except Exception:
+        return 0
+    
+    with _COUNT_LOCK:
+        _COUNT_CACHE[path] = (st.st_mtime, st.st_size, count)
+        # Drop files that are gone, such as the shard stores of merged parallel runs
+        for stale in [p for p in _COUNT_CACHE if not os.path.exists(p)]:
+            del _COUNT_CACHE[stale]
+    return count
+
+def _store_status(output_dir: str, json_name: str) -> Dict[str, Any]:
+    """Describe the record store data-status counts: the .jsonl store if present, else the .json array
+
+    The scraper appends to the .jsonl store after every extraction (parallel runs to one per
+    shard, merged at the end) and only rewrites the .json array when the run ends.
+    """
+    jsonl_name = json_name[:-len(".json")] + ".jsonl"
+    store = os.path.join(output_dir, jsonl_name)
+    if not os.path.exists(store):
+        store = os.path.join(output_dir, json_name)
+    paths = [store] + glob.glob(os.path.join(output_dir, "shards", "run_*", "*", jsonl_name))
+    
+    size = 0
+    exists = False
+    for path in paths:
+        try:
+            size += os.path.getsize(path)
+            exists = True
+        except OSError:
+            pass
+    return {
+        "file": os.path.basename(store),
+        "exists": exists,
+        "size": size,
+        # Streamed, so large outputs don't get parsed into memory
+        "records": sum(_count_json_records(path) for path in paths),
+    }
+
+_GZIP_LOCK = threading.Lock()
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+async def _iter_file(path: str, size: int):
+    """Read a file in large chunks without tying up a threadpool worker per client"""
+    # Stop at the size sent as Content-Length, since a JSONL store may grow while it streams
+    async with aiofiles.open(path, 'rb') as f:
+        while size > 0 and (chunk := await f.read(min(size, _DOWNLOAD_CHUNK_SIZE))):
+            size -= len(chunk)
+            yield chunk
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values such as gzip;q=0"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.lower()] = weight
+    return weights.get("gzip", weights.get("*", 0.0)) > 0
+
+def _json_file_response(path: str, filename: str, request: Request, media_type: str = "application/json") -> StreamingResponse:
+    """Stream a JSON file, from a pre-compressed .gz copy when the client accepts gzip"""
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        gz_path = path + ".gz"
+        with _GZIP_LOCK:
+            # Recompress only when the JSON has changed since the last download
+            if not os.path.exists(gz_path) or os.path.getmtime(gz_path) < os.path.getmtime(path):
+                tmp_path = f"{gz_path}.{os.getpid()}.tmp"
+                with open(path, 'rb') as src, gzip.open(tmp_path, 'wb', compresslevel=3) as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+                os.replace(tmp_path, gz_path)
+        path = gz_path
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    
+    size = os.path.getsize(path)
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(_iter_file(path, size), media_type=media_type, headers=headers)
 
 @app.post("/scrape/start", response_model=JobStatus)
 def start_scrape(req: StartJobRequest, background_tasks: BackgroundTasks):
@@ -76,10 +306,10 @@ def start_scrape(req: StartJobRequest, background_tasks: BackgroundTasks):
     if not output_dir or output_dir == "string" or not os.path.isabs(output_dir):
         output_dir = "/app/data"
     
-    job = _Job(job_id, output_dir, req.headless)
-    _JOBS[job_id] = job
+    job = _Job(job_id, output_dir, req.headless, req.workers)
+    job.save()
 
-    # Start background thread
+    # Start background thread (it only supervises the scraper process)
     def target():
         job.run()
 
@@ -91,92 +321,86 @@ def start_scrape(req: StartJobRequest, background_tasks: BackgroundTasks):
 
 @app.get("/scrape/status/{job_id}", response_model=JobStatus)
 def get_status(job_id: str):
-    job = _JOBS.get(job_id)
-    if not job:
+    run = _get_run(job_id)
+    if not run:
         return JobStatus(job_id=job_id, status="unknown", message="No such job.")
-    return JobStatus(job_id=job.job_id, status=job.status, message=job.message, output_dir=job.output_dir)
+    return JobStatus(job_id=run["id"], status=run["status"], message=run["message"], output_dir=run["output_dir"])
 
 @app.get("/health")
 def health():
     return {"ok": True}
 
-@app.get("/scrape/download/{job_id}/spanish")
-def download_spanish_data(job_id: str):
-    job = _JOBS.get(job_id)
-    if not job:
+def _download_records(job_id: str, language: str, request: Request, format: str) -> StreamingResponse:
+    """Stream a job's consolidated records in one language
+
+    The JSON array is rewritten only when a run ends; format=jsonl serves the store the
+    scraper appends to after every extraction (parallel runs merge theirs at the end).
+    """
+    run = _get_run(job_id)
+    if not run:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    spanish_file = os.path.join(job.output_dir, "cfe_tariff_data_spanish.json")
-    if not os.path.exists(spanish_file):
-        raise HTTPException(status_code=404, detail="Spanish data file not found")
+    filename = f"cfe_tariff_data_{language}.{format}"
+    data_file = os.path.join(run["output_dir"], filename)
+    if not os.path.exists(data_file):
+        raise HTTPException(status_code=404, detail=f"{language.capitalize()} data file not found")
     
-    return FileResponse(spanish_file, filename="cfe_tariff_data_spanish.json")
+    media_type = "application/x-ndjson" if format == "jsonl" else "application/json"
+    return _json_file_response(data_file, filename, request, media_type)
+
+@app.get("/scrape/download/{job_id}/spanish")
+def download_spanish_data(job_id: str, request: Request, format: Literal["json", "jsonl"] = "json"):
+    return _download_records(job_id, "spanish", request, format)
 
 @app.get("/scrape/download/{job_id}/english")
-def download_english_data(job_id: str):
-    job = _JOBS.get(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    english_file = os.path.join(job.output_dir, "cfe_tariff_data_english.json")
-    if not os.path.exists(english_file):
-        raise HTTPException(status_code=404, detail="English data file not found")
-    
-    return FileResponse(english_file, filename="cfe_tariff_data_english.json")
+def download_english_data(job_id: str, request: Request, format: Literal["json", "jsonl"] = "json"):
+    return _download_records(job_id, "english", request, format)
 
-@app.get("/scrape/failures/{job_id}")
+@app.get("/scrape/failures/{job_id}", response_model=FailuresResponse)
 def get_failed_extractions(job_id: str):
-    job = _JOBS.get(job_id)
-    if not job:
+    run = _get_run(job_id)
+    if not run:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    failures_file = os.path.join(job.output_dir, "failed_extractions.json")
+    failures_file = os.path.join(run["output_dir"], "failed_extractions.json")
     if not os.path.exists(failures_file):
-        return JSONResponse(content={"failures": [], "total": 0})
+        return {"failures": [], "total": 0}
     
     try:
-        with open(failures_file, 'r', encoding='utf-8') as f:
-            failures = json.load(f)
-        return JSONResponse(content={"failures": failures, "total": len(failures)})
+        with open(failures_file, 'rb', buffering=1 << 20) as f:
+            failures = orjson.loads(f.read())
+        return {"failures": failures, "total": len(failures)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading failures: {str(e)}")
 
-@app.get("/scrape/list")
+@app.get("/scrape/list", response_model=JobList)
 def list_all_jobs():
+    rows = _connect().execute(_LIST_RUNS_SQL).fetchall()
     jobs = []
-    for job_id, job in _JOBS.items():
+    for row in rows:
         jobs.append({
-            "job_id": job_id,
-            "status": job.status,
-            "output_dir": job.output_dir,
-            "message": job.message
+            "job_id": row["id"],
+            "status": row["status"],
+            "output_dir": row["output_dir"],
+            "message": row["message"]
         })
     return {"jobs": jobs}
 
 @app.get("/scrape/data-status/{job_id}")
 def get_data_status(job_id: str):
-    job = _JOBS.get(job_id)
-    if not job:
+    run = _get_run(job_id)
+    if not run:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    spanish_file = os.path.join(job.output_dir, "cfe_tariff_data_spanish.json")
-    english_file = os.path.join(job.output_dir, "cfe_tariff_data_english.json")
-    failures_file = os.path.join(job.output_dir, "failed_extractions.json")
+    failures_file = os.path.join(run["output_dir"], "failed_extractions.json")
     
     status = {
         "job_id": job_id,
-        "output_dir": job.output_dir,
+        "output_dir": run["output_dir"],
         "files": {
-            "spanish_data": {
-                "exists": os.path.exists(spanish_file),
-                "size": os.path.getsize(spanish_file) if os.path.exists(spanish_file) else 0,
-                "records": 0
-            },
-            "english_data": {
-                "exists": os.path.exists(english_file),
-                "size": os.path.getsize(english_file) if os.path.exists(english_file) else 0,
-                "records": 0
-            },
+            # The JSONL stores are reported when present, so a running job shows its progress
+            "spanish_data": _store_status(run["output_dir"], "cfe_tariff_data_spanish.json"),
+            "english_data": _store_status(run["output_dir"], "cfe_tariff_data_english.json"),
             "failures": {
                 "exists": os.path.exists(failures_file),
                 "size": os.path.getsize(failures_file) if os.path.exists(failures_file) else 0,
@@ -185,31 +409,8 @@ def get_data_status(job_id: str):
         }
     }
     
-    # Count records in Spanish file
-    if os.path.exists(spanish_file):
-        try:
-            with open(spanish_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                status["files"]["spanish_data"]["records"] = len(data)
-        except:
-            pass
-    
-    # Count records in English file
-    if os.path.exists(english_file):
-        try:
-            with open(english_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                status["files"]["english_data"]["records"] = len(data)
-        except:
-            pass
-    
-    # Count failures
+    # Count failures (streamed, so large outputs don't get parsed into memory)
     if os.path.exists(failures_file):
-        try:
-            with open(failures_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                status["files"]["failures"]["count"] = len(data)
-        except:
-            pass
+        status["files"]["failures"]["count"] = _count_json_records(failures_file)
     
     return status
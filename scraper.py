@@ -1,7 +1,12 @@
 import os
 import time
-import json
-import pandas as pd
+import orjson
+import shutil
+import glob
+import atexit
+import multiprocessing
+import queue
+import threading
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select, WebDriverWait
@@ -9,73 +14,250 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from googletrans import Translator
+from lxml import etree
+from lxml import html as lxml_html
 import logging
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# All fare types and their URLs
+FARE_URLS = {
+    "GDMTO": "https://app.cfe.mx/Aplicaciones/CCFE/Tarifas/TarifasCREIndustria/Tarifas/GranDemandaMTO.aspx",
+    # "GDMTH": "https://app.cfe.mx/Aplicaciones/CCFE/Tarifas/TarifasCREIndustria/Tarifas/GranDemandaMTH.aspx", 
+    # "DIST": "https://app.cfe.mx/Aplicaciones/CCFE/Tarifas/TarifasCREIndustria/Tarifas/DemandaIndustrialSub.aspx",
+    # "DIT": "https://app.cfe.mx/Aplicaciones/CCFE/Tarifas/TarifasCREIndustria/Tarifas/DemandaIndustrialTran.aspx"
+}
+
+SPANISH_DATA_FILENAME = "cfe_tariff_data_spanish.json"
+ENGLISH_DATA_FILENAME = "cfe_tariff_data_english.json"
+FAILURES_FILENAME = "failed_extractions.json"
+TRANSLATION_CACHE_FILENAME = "translation_cache.json"
+
+# Consolidated records are appended to JSONL stores during a run and exported
+# to the JSON array files above once the run ends
+SPANISH_JSONL_FILENAME = "cfe_tariff_data_spanish.jsonl"
+ENGLISH_JSONL_FILENAME = "cfe_tariff_data_english.jsonl"
+CONSOLIDATED_FILES = (
+    (SPANISH_JSONL_FILENAME, SPANISH_DATA_FILENAME),
+    (ENGLISH_JSONL_FILENAME, ENGLISH_DATA_FILENAME),
+)
+
+# Spanish month names indexed by month number (index 0 unused)
+_MONTH_NAMES = (
+    "", "ENERO", "FEBRERO", "MARZO", "ABRIL", "MAYO", "JUNIO",
+    "JULIO", "AGOSTO", "SEPTIEMBRE", "OCTUBRE", "NOVIEMBRE", "DICIEMBRE"
+)
+
+# Record fields that get translated for the English output
+TRANSLATED_FIELDS = ("region", "municipality", "division", "post", "units", "month_name")
+
+# Directories already created by this process, so repeated saves skip the makedirs syscalls
+_CREATED_DIRS = set()
+
+def _makedirs_cached(path):
+    """os.makedirs(path, exist_ok=True), done at most once per path"""
+    if path not in _CREATED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _CREATED_DIRS.add(path)
+
+# Characters that are replaced with "_" in file and folder names
+_UNSAFE_FILENAME_CHARS = str.maketrans({c: "_" for c in ' /\\:*?"<>|.'})
+
+# Rows of the first table.table-bordered on the page, and the data cells of a row
+_TARIFF_TABLE_ROWS = etree.XPath(
+    '(//table[contains(concat(" ", normalize-space(@class), " "), " table-bordered ")])[1]//tr'
+)
+_ROW_CELLS = etree.XPath('.//td')
+
+# Requests the scraper never needs; blocked through the DevTools protocol
+_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico",
+    "*.css", "*.woff", "*.woff2", "*.ttf",
+    "*/ga.js", "*google-analytics*", "*googletagmanager*",
+]
+
+# True once no jQuery request or ASP.NET partial postback is in flight
+_AJAX_IDLE_JS = """
+return (typeof jQuery === 'undefined' || jQuery.active === 0) &&
+    (typeof Sys === 'undefined' || !Sys.WebForms ||
+     !Sys.WebForms.PageRequestManager.getInstance().get_isInAsyncPostBack());
+"""
+
+# Set a <select>'s value and fire its change handler in one WebDriver call; returns false
+# (leaving the selection as it was) when no option has that value, 'unchanged' without
+# firing anything when it is already selected, like Select.select_by_value, and otherwise
+# whether the change starts a postback.
+# AutoPostBack calls __doPostBack from a setTimeout, so right after the change the old page
+# still looks loaded and idle. window.__cfePostbackPending marks it instead: a full postback
+# replaces the window and drops the flag, and a partial one clears it on endRequest
+_SELECT_OPTION_JS = """
+var el = arguments[0];
+if (el.value === arguments[1]) {
+    return 'unchanged';
+}
+var previous = el.selectedIndex;
+el.value = arguments[1];
+if (el.value !== arguments[1]) {
+    el.selectedIndex = previous;
+    return false;
+}
+var postsBack = /__doPostBack/.test(el.getAttribute('onchange') || '');
+if (postsBack) {
+    window.__cfePostbackPending = true;
+    if (typeof Sys !== 'undefined' && Sys.WebForms) {
+        var prm = Sys.WebForms.PageRequestManager.getInstance();
+        var done = function () {
+            window.__cfePostbackPending = false;
+            prm.remove_endRequest(done);
+        };
+        prm.add_endRequest(done);
+    }
+}
+el.dispatchEvent(new Event('change', {bubbles: true}));
+return postsBack ? 'postback' : 'changed';
+"""
+_POSTBACK_PENDING_JS = "return window.__cfePostbackPending === true;"
+
 class CFETariffScraperSimplified:
-    def __init__(self, output_dir, headless=False):
-        # Define all fare types and their URLs
+    def __init__(self, output_dir, headless=False, shard_index=0, num_shards=1, extraction_dir=None, fare_types=None):
+        # Fare types to scrape (all of them unless restricted)
         self.fare_urls = {
-            "GDMTO": "https://app.cfe.mx/Aplicaciones/CCFE/Tarifas/TarifasCREIndustria/Tarifas/GranDemandaMTO.aspx",
-            # "GDMTH": "https://app.cfe.mx/Aplicaciones/CCFE/Tarifas/TarifasCREIndustria/Tarifas/GranDemandaMTH.aspx", 
-            # "DIST": "https://app.cfe.mx/Aplicaciones/CCFE/Tarifas/TarifasCREIndustria/Tarifas/DemandaIndustrialSub.aspx",
-            # "DIT": "https://app.cfe.mx/Aplicaciones/CCFE/Tarifas/TarifasCREIndustria/Tarifas/DemandaIndustrialTran.aspx"
+            fare_type: url for fare_type, url in FARE_URLS.items()
+            if fare_types is None or fare_type in fare_types
         }
         
         self.output_dir = output_dir
+        # Only regions whose position satisfies idx % num_shards == shard_index are scraped
+        self.shard_index = shard_index
+        self.num_shards = num_shards
         self.driver = None
         self.wait = None
         self.translator = Translator()
+        # English output is produced on a background thread while scraping continues
+        self._translate_queue = queue.Queue()
+        self._translator_thread = None
+        # Dropdown options keyed by dropdown and the selections above it; they don't vary by period
+        self._options_cache = {}
         self.setup_driver(headless)
         
         # Create output directories
         os.makedirs(output_dir, exist_ok=True)
-        self.extraction_dir = os.path.join(output_dir, "extraction")
+        self.extraction_dir = extraction_dir or os.path.join(output_dir, "extraction")
         os.makedirs(self.extraction_dir, exist_ok=True)
         
-        # Initialize JSON files (main consolidated files)
-        self.original_data_file = os.path.join(output_dir, "cfe_tariff_data_spanish.json")
-        self.translated_data_file = os.path.join(output_dir, "cfe_tariff_data_english.json")
+        # Initialize consolidated files (append-only JSONL, exported as JSON arrays at the end)
+        self.original_data_file = os.path.join(output_dir, SPANISH_JSONL_FILENAME)
+        self.translated_data_file = os.path.join(output_dir, ENGLISH_JSONL_FILENAME)
+        self.original_json_file = os.path.join(output_dir, SPANISH_DATA_FILENAME)
+        self.translated_json_file = os.path.join(output_dir, ENGLISH_DATA_FILENAME)
+        
+        # Spanish -> English strings already translated, kept on disk across runs
+        self.translation_cache_file = os.path.join(output_dir, TRANSLATION_CACHE_FILENAME)
+        self._trans_cache = self.load_translation_cache(self.translation_cache_file)
         
         # Initialize failure tracking
-        self.failed_extractions_file = os.path.join(output_dir, "failed_extractions.json")
+        self.failed_extractions_file = os.path.join(output_dir, FAILURES_FILENAME)
         self.failed_extractions = self.load_existing_data(self.failed_extractions_file)
+        # Failures are buffered and written per period, and on interpreter exit as a backstop
+        self._failures_dirty = False
+        atexit.register(self.flush_failures)
+        
+        # Carry over data from earlier runs and count it, without holding it in memory
+        self.seed_jsonl_from_json(self.original_data_file, self.original_json_file)
+        self.seed_jsonl_from_json(self.translated_data_file, self.translated_json_file)
+        self.original_count = self.count_jsonl_records(self.original_data_file)
+        self.translated_count = self.count_jsonl_records(self.translated_data_file)
         
-        # Load existing data
-        self.original_data = self.load_existing_data(self.original_data_file)
-        self.translated_data = self.load_existing_data(self.translated_data_file)
+        # Extractions finished by earlier runs, found with one directory walk instead of a stat per tuple.
+        # The English file is written later by the translator thread, so it is tracked separately
+        self.completed_extractions = set(
+            glob.glob(os.path.join(self.extraction_dir, "**", "*_spanish.json"), recursive=True)
+        )
+        self.translated_extractions = set(
+            glob.glob(os.path.join(self.extraction_dir, "**", "*_english.json"), recursive=True)
+        )
+        # (fare, id) of the English JSONL records, loaded only if a batch has to be re-translated
+        self._translated_keys = None
         
-    def load_existing_data(self, filepath):
-        """Load existing data from JSON file"""
+    @staticmethod
+    def load_existing_data(filepath):
+        """Load existing data from a JSON array or JSONL file"""
         try:
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
+            if not os.path.exists(filepath):
+                return []
+            if filepath.endswith(".jsonl"):
+                records = []
+                with open(filepath, 'rb') as f:
+                    for line_no, line in enumerate(f, 1):
+                        if not line.strip():
+                            continue
+                        try:
+                            records.append(orjson.loads(line))
+                        except ValueError:
+                            # A run killed mid-write can leave a truncated last line
+                            logger.warning(f"Skipping unreadable line {line_no} in {filepath}")
+                return records
+            with open(filepath, 'rb') as f:
+                return orjson.loads(f.read())
         except Exception as e:
             logger.warning(f"Could not load existing data from {filepath}: {e}")
             return []
     
-    def save_json_data(self, data, filepath):
+    @staticmethod
+    def append_jsonl(records, filepath):
+        """Append records to a JSONL file, one JSON object per line"""
+        try:
+            with open(filepath, 'ab') as f:
+                f.writelines(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in records)
+        except Exception as e:
+            logger.error(f"Error appending data to {filepath}: {e}")
+    
+    @staticmethod
+    def count_jsonl_records(filepath):
+        """Count the records in a JSONL file"""
+        if not os.path.exists(filepath):
+            return 0
+        with open(filepath, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+    
+    @classmethod
+    def load_translation_cache(cls, filepath):
+        """Load a Spanish -> English translation cache file"""
+        cache = cls.load_existing_data(filepath)
+        return cache if isinstance(cache, dict) else {}
+    
+    @classmethod
+    def seed_jsonl_from_json(cls, jsonl_path, json_path):
+        """Start a JSONL store from an existing JSON array file, so earlier runs are kept"""
+        if not os.path.exists(jsonl_path) and os.path.exists(json_path):
+            cls.append_jsonl(cls.load_existing_data(json_path), jsonl_path)
+    
+    @classmethod
+    def export_jsonl_as_json(cls, jsonl_path, json_path):
+        """Write the records of a JSONL store out as a JSON array file"""
+        if os.path.exists(jsonl_path):
+            cls.save_json_data(cls.load_existing_data(jsonl_path), json_path)
+    
+    @staticmethod
+    def save_json_data(data, filepath):
         """Save data to JSON file"""
         try:
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            _makedirs_cached(os.path.dirname(filepath))
+            # Written to a temp file and swapped in, so a run killed mid-write never leaves a
+            # truncated file that resume would take for a finished extraction
+            tmp_path = f"{filepath}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, filepath)
             logger.info(f"Data saved to: {filepath}")
         except Exception as e:
             logger.error(f"Error saving data to {filepath}: {e}")
     
     def create_safe_filename(self, name):
         """Create safe filename by removing/replacing problematic characters"""
-        safe_name = name.replace(" ", "_").replace("/", "_").replace("\\", "_")
-        safe_name = safe_name.replace(":", "_").replace("*", "_").replace("?", "_")
-        safe_name = safe_name.replace('"', "_").replace("<", "_").replace(">", "_")
-        safe_name = safe_name.replace("|", "_").replace(".", "_")
-        return safe_name
+        return name.translate(_UNSAFE_FILENAME_CHARS)
     
     def get_region_municipality_path(self, region_name, municipality_name):
         """Get the folder path for a specific region and municipality"""
@@ -86,7 +268,7 @@ class CFETariffScraperSimplified:
         municipality_path = os.path.join(region_path, safe_municipality)
         
         # Create directories if they don't exist
-        os.makedirs(municipality_path, exist_ok=True)
+        _makedirs_cached(municipality_path)
         
         return municipality_path
     
@@ -104,19 +286,32 @@ class CFETariffScraperSimplified:
         }
         
         self.failed_extractions.append(failure_record)
-        self.save_json_data(self.failed_extractions, self.failed_extractions_file)
+        self._failures_dirty = True
         logger.error(f"Failure tracked: {fare_type} - {region_name}/{municipality_name}/{division_name} - {error_msg}")
     
+    def flush_failures(self):
+        """Write buffered failures to disk if any were tracked since the last flush"""
+        if self._failures_dirty:
+            self.save_json_data(self.failed_extractions, self.failed_extractions_file)
+            self._failures_dirty = False
+    
     def translate_text(self, text, dest='en'):
-        """Translate text using Google Translate"""
+        """Translate text using Google Translate, reusing cached English translations"""
+        if not text or text.strip() == "":
+            return text
+        if dest == 'en' and text in self._trans_cache:
+            return self._trans_cache[text]
+        
         try:
-            if not text or text.strip() == "":
-                return text
-            translated = self.translator.translate(text, dest=dest)
-            return translated.text
+            translated = self.translator.translate(text, dest=dest).text
         except Exception as e:
             logger.warning(f"Translation failed for '{text}': {e}")
             return text
+        
+        # Failed translations aren't cached, so they are retried later
+        if dest == 'en':
+            self._trans_cache[text] = translated
+        return translated
     
     def setup_driver(self, headless):
         """Initialize Chrome driver with options"""
@@ -128,39 +323,75 @@ class CFETariffScraperSimplified:
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
         
+        # Return from navigation at DOMContentLoaded; the explicit waits cover the rest
+        chrome_options.page_load_strategy = 'eager'
+        
+        # Only the HTML table is read, so skip images; stylesheets and fonts are blocked below
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+        
         self.driver = webdriver.Chrome(options=chrome_options)
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            logger.warning(f"Could not enable resource blocking: {e}")
         self.wait = WebDriverWait(self.driver, 15)
     
-    def wait_for_page_load(self, timeout=10):
-        """Wait for page to fully load after dropdown selection"""
-        time.sleep(2)
+    def wait_for_page_load(self, postback=False):
+        """Wait for page to fully load after dropdown selection; returns False if it never did"""
+        if postback:
+            # Until the postback's response arrives the previous page is still fully loaded,
+            # so reading it now would pick up the old tables and dropdown options
+            try:
+                self.wait.until(lambda driver: not driver.execute_script(_POSTBACK_PENDING_JS))
+            except TimeoutException:
+                logger.warning("Postback did not complete in time")
+                return False
         try:
-            self.wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
-            time.sleep(1)
+            # "interactive" is enough: the DOM is parsed, only subresources may still be loading
+            self.wait.until(lambda driver: driver.execute_script("return document.readyState") != "loading")
+            self.wait.until(lambda driver: driver.execute_script(_AJAX_IDLE_JS))
         except TimeoutException:
             logger.warning("Page load timeout, continuing...")
+        return True
     
     def select_dropdown_option(self, dropdown_id, value, value_type="value"):
         """Select option from dropdown and wait for page refresh"""
         try:
             dropdown_element = self.wait.until(EC.presence_of_element_located((By.ID, dropdown_id)))
-            dropdown = Select(dropdown_element)
             
-            if value_type == "value":
-                dropdown.select_by_value(str(value))
-            elif value_type == "text":
-                dropdown.select_by_visible_text(value)
+            option_value = str(value)
+            if value_type == "text":
+                matches = [
+                    option.get_attribute("value") for option in Select(dropdown_element).options
+                    if option.text.strip() == value.strip()
+                ]
+                if not matches:
+                    raise NoSuchElementException(f"Cannot locate option with text: {value}")
+                option_value = matches[0]
+            
+            result = self.driver.execute_script(_SELECT_OPTION_JS, dropdown_element, option_value)
+            if not result:
+                raise NoSuchElementException(f"Cannot locate option with value: {value}")
             
             logger.info(f"Selected {value} from {dropdown_id}")
-            self.wait_for_page_load()
+            if not self.wait_for_page_load(postback=result == "postback"):
+                logger.error(f"Page did not reload after selecting {value} from {dropdown_id}")
+                return False
             return True
             
         except (TimeoutException, NoSuchElementException) as e:
             logger.error(f"Error selecting {value} from {dropdown_id}: {e}")
             return False
     
-    def get_available_options(self, dropdown_id):
-        """Get all available options from a dropdown"""
+    def get_available_options(self, dropdown_id, cache_key=None):
+        """Get all available options from a dropdown, reusing earlier results for the same cache_key"""
+        if cache_key is not None and cache_key in self._options_cache:
+            return self._options_cache[cache_key]
+        
         try:
             dropdown_element = self.wait.until(EC.presence_of_element_located((By.ID, dropdown_id)))
             dropdown = Select(dropdown_element)
@@ -172,27 +403,31 @@ class CFETariffScraperSimplified:
                 if value and value != "0" and text and "Seleccione" not in text and "Select" not in text:
                     options.append({"value": value, "text": text})
             
+            # Empty lists aren't cached so a slow postback gets another chance next period
+            if cache_key is not None and options:
+                self._options_cache[cache_key] = options
             return options
         except (TimeoutException, NoSuchElementException) as e:
             logger.error(f"Error getting options from {dropdown_id}: {e}")
             return []
     
     def extract_clean_text(self, element):
-        """Extract clean text from element, handling nested font tags"""
-        try:
-            text = element.text.strip()
-            if not text:
-                text = element.get_attribute('textContent').strip()
-            return text
-        except:
-            return ""
+        """Extract clean text from an lxml element, handling nested font tags"""
+        # WebDriver's rendered .text, which earlier runs stored, kept a line break for each <br>,
+        # so keep those and collapse the other whitespace within each line. The page is parsed
+        # per extraction, so marking the breaks in the tree itself is harmless
+        for br in element.iter("br"):
+            br.tail = "\n" + (br.tail or "")
+        lines = (element.text_content() or "").split("\n")
+        return "\n".join(" ".join(line.split()) for line in lines).strip()
     
     def extract_table_data_simplified(self, fare_type, region_name, municipality_name, division_name, year, month):
         """Simplified table extraction - only fare, post, units, and tariff value"""
         try:
-            # Find the table
-            table = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.table-bordered")))
-            rows = table.find_elements(By.TAG_NAME, "tr")
+            # Wait for the table, then parse the page once instead of querying every cell over WebDriver
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.table-bordered")))
+            tree = lxml_html.fromstring(self.driver.page_source)
+            rows = _TARIFF_TABLE_ROWS(tree)
             
             if len(rows) < 2:
                 logger.warning("No data rows found in table")
@@ -202,8 +437,7 @@ class CFETariffScraperSimplified:
             
             # Process data rows
             for i, row in enumerate(rows[1:], 1):
-                th_cells = row.find_elements(By.TAG_NAME, "th")
-                td_cells = row.find_elements(By.TAG_NAME, "td")
+                td_cells = _ROW_CELLS(row)
                 
                 # We only need the last 3 td cells (post, units, value)
                 if len(td_cells) >= 3:
@@ -241,54 +475,105 @@ class CFETariffScraperSimplified:
     
     def get_month_name(self, month_num):
         """Get month name in Spanish"""
-        month_names = {
-            1: "ENERO", 2: "FEBRERO", 3: "MARZO", 4: "ABRIL",
-            5: "MAYO", 6: "JUNIO", 7: "JULIO", 8: "AGOSTO", 
-            9: "SEPTIEMBRE", 10: "OCTUBRE", 11: "NOVIEMBRE", 12: "DICIEMBRE"
-        }
-        return month_names.get(month_num, str(month_num))
+        return _MONTH_NAMES[month_num] if 1 <= month_num <= 12 else str(month_num)
     
     def translate_data_record(self, record):
         """Translate specific fields in a record"""
         translated_record = record.copy()
         
-        # Translate specific fields
-        fields_to_translate = [
-            "region", "municipality", "division", "post", "units", "month_name"
-        ]
-        
-        for field in fields_to_translate:
+        # Translate specific fields; repeated strings come from the translation cache
+        for field in TRANSLATED_FIELDS:
             if field in translated_record and translated_record[field]:
                 translated_record[field] = self.translate_text(translated_record[field])
         
         return translated_record
     
+    def get_individual_file_base(self, fare_type, region_name, municipality_name, division_name, year, month):
+        """Get the path prefix shared by an extraction's Spanish and English individual files"""
+        municipality_path = self.get_region_municipality_path(region_name, municipality_name)
+        
+        # Create filename with fare_type, division, year, month info
+        safe_division = self.create_safe_filename(division_name)
+        filename_base = f"{fare_type}_{safe_division}_{year}_{month:02d}"
+        return os.path.join(municipality_path, filename_base)
+    
     def save_individual_files(self, data, fare_type, region_name, municipality_name, division_name, year, month):
-        """Save data to individual files in the nested folder structure"""
+        """Save the Spanish data to its individual file in the nested folder structure"""
         if not data:
             return
         
         try:
-            municipality_path = self.get_region_municipality_path(region_name, municipality_name)
-            
-            # Create filename with fare_type, division, year, month info
-            safe_division = self.create_safe_filename(division_name)
-            filename_base = f"{fare_type}_{safe_division}_{year}_{month:02d}"
-            
-            # Save Spanish version
-            spanish_file = os.path.join(municipality_path, f"{filename_base}_spanish.json")
-            self.save_json_data(data, spanish_file)
-            
-            # Translate and save English version
-            translated_data = [self.translate_data_record(record) for record in data]
-            english_file = os.path.join(municipality_path, f"{filename_base}_english.json")
-            self.save_json_data(translated_data, english_file)
-            
+            file_base = self.get_individual_file_base(fare_type, region_name, municipality_name, division_name, year, month)
+            self.save_json_data(data, f"{file_base}_spanish.json")
             logger.info(f"Individual files saved for {fare_type}/{region_name}/{municipality_name}/{division_name}")
             
         except Exception as e:
             logger.error(f"Error saving individual files: {e}")
     
+    def load_translated_keys(self):
+        """Collect the (fare, id) of every record already in the English JSONL store"""
+        keys = set()
+        if os.path.exists(self.translated_data_file):
+            with open(self.translated_data_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                    except ValueError:
+                        continue
+                    keys.add((record.get("fare"), record.get("id")))
+        return keys
+    
+    def translate_and_save_batch(self, new_data, english_file, resumed=False):
+        """Translate a batch of records and write the English individual and consolidated outputs"""
+        try:
+            translated_new_data = [self.translate_data_record(record) for record in new_data]
+            
+            # A resumed batch may have reached the JSONL before its run died, so only its missing records are added
+            new_records = translated_new_data
+            if resumed:
+                new_records = [
+                    record for record in translated_new_data
+                    if (record.get("fare"), record.get("id")) not in self._translated_keys
+                ]
+            self.append_jsonl(new_records, self.translated_data_file)
+            self.translated_count += len(new_records)
+            logger.info(f"Saved consolidated English data: {self.translated_count} total records")
+            
+            # Written last: resume treats the English file as the batch being fully saved
+            self.save_json_data(translated_new_data, english_file)
+        except Exception as e:
+            logger.error(f"Error translating batch of {len(new_data)} records: {e}")
+    
+    def _translator_worker(self):
+        """Consume queued batches until the None sentinel arrives"""
+        while True:
+            item = self._translate_queue.get()
+            if item is None:
+                break
+            self.translate_and_save_batch(*item)
+    
+    def start_translator(self):
+        """Start the background translation thread"""
+        self._translator_thread = threading.Thread(target=self._translator_worker, name="translator", daemon=True)
+        self._translator_thread.start()
+    
+    def stop_translator(self):
+        """Wait for queued translations to finish and stop the background thread"""
+        if self._translator_thread is None:
+            return
+        self._translate_queue.put(None)
+        self._translator_thread.join()
+        self._translator_thread = None
+    
+    def queue_translation(self, new_data, english_file, resumed=False):
+        """Hand a batch to the translator thread, or translate it inline if none is running"""
+        if resumed and self._translated_keys is None:
+            self._translated_keys = self.load_translated_keys()
+        if self._translator_thread is not None:
+            self._translate_queue.put((new_data, english_file, resumed))
+        else:
+            self.translate_and_save_batch(new_data, english_file, resumed)
+    
     def append_and_save_data(self, new_data, fare_type, region_name, municipality_name, division_name, year, month):
         """Append new data to existing collections and save both consolidated and individual files"""
         if not new_data:
@@ -299,20 +584,19 @@ class CFETariffScraperSimplified:
         self.save_individual_files(new_data, fare_type, region_name, municipality_name, division_name, year, month)
         
         # Append to consolidated data
-        self.original_data.extend(new_data)
-        self.save_json_data(self.original_data, self.original_data_file)
-        logger.info(f"Saved consolidated Spanish data: {len(self.original_data)} total records")
+        self.append_jsonl(new_data, self.original_data_file)
+        self.original_count += len(new_data)
+        logger.info(f"Saved consolidated Spanish data: {self.original_count} total records")
         
-        # Translate and append to consolidated translated data
-        translated_new_data = [self.translate_data_record(record) for record in new_data]
-        self.translated_data.extend(translated_new_data)
-        self.save_json_data(self.translated_data, self.translated_data_file)
-        logger.info(f"Saved consolidated English data: {len(self.translated_data)} total records")
+        # Hand the English side to the translator thread
+        file_base = self.get_individual_file_base(fare_type, region_name, municipality_name, division_name, year, month)
+        self.queue_translation(new_data, f"{file_base}_english.json")
         
-        logger.info(f"Appended {len(new_data)} new records for {year}-{month:02d}. Total records: {len(self.original_data)}")
+        logger.info(f"Appended {len(new_data)} new records for {year}-{month:02d}. Total records: {self.original_count}")
     
     def scrape_all_data(self):
         """Main scraping function for all fare types"""
+        self.start_translator()
         try:
             # Define periods to scrape
             periods = []
@@ -349,10 +633,13 @@ class CFETariffScraperSimplified:
                             continue
                         
                         # Get regions
-                        regions = self.get_available_options("ContentPlaceHolder1_EdoMpoDiv_ddEstado")
+                        regions = self.get_available_options("ContentPlaceHolder1_EdoMpoDiv_ddEstado", cache_key=("ddEstado",))
                         logger.info(f"Found {len(regions)} regions for {fare_type}")
                         
-                        for region in regions:
+                        for region_idx, region in enumerate(regions):
+                            if region_idx % self.num_shards != self.shard_index:
+                                continue
+                            
                             region_value = region["value"]
                             region_name = region["text"]
                             
@@ -365,7 +652,9 @@ class CFETariffScraperSimplified:
                                     continue
                                 
                                 # Get municipalities
-                                municipalities = self.get_available_options("ContentPlaceHolder1_EdoMpoDiv_ddMunicipio")
+                                municipalities = self.get_available_options(
+                                    "ContentPlaceHolder1_EdoMpoDiv_ddMunicipio", cache_key=("ddMunicipio", region_value)
+                                )
                                 
                                 for municipality in municipalities:
                                     municipality_value = municipality["value"]
@@ -380,7 +669,10 @@ class CFETariffScraperSimplified:
                                             continue
                                         
                                         # Get divisions
-                                        divisions = self.get_available_options("ContentPlaceHolder1_EdoMpoDiv_ddDivision")
+                                        divisions = self.get_available_options(
+                                            "ContentPlaceHolder1_EdoMpoDiv_ddDivision",
+                                            cache_key=("ddDivision", region_value, municipality_value)
+                                        )
                                         
                                         if not divisions:
                                             self.track_failure(fare_type, region_name, municipality_name, "N/A", year, month, "No divisions available")
@@ -393,6 +685,21 @@ class CFETariffScraperSimplified:
                                             logger.info(f"Processing {fare_type} - division: {division_name}")
                                             
                                             try:
+                                                # Skip extractions a previous (interrupted) run already saved
+                                                file_base = self.get_individual_file_base(
+                                                    fare_type, region_name, municipality_name, division_name, year, month
+                                                )
+                                                spanish_file = f"{file_base}_spanish.json"
+                                                if spanish_file in self.completed_extractions and os.path.getsize(spanish_file) > 2:
+                                                    english_file = f"{file_base}_english.json"
+                                                    if english_file not in self.translated_extractions:
+                                                        # The run died with this batch still queued for translation
+                                                        logger.info(f"Re-queuing translation for {fare_type}/{region_name}/{municipality_name}/{division_name} - {year}-{month:02d}")
+                                                        self.queue_translation(self.load_existing_data(spanish_file), english_file, resumed=True)
+                                                    else:
+                                                        logger.info(f"Already extracted {fare_type}/{region_name}/{municipality_name}/{division_name} - {year}-{month:02d}, skipping")
+                                                    continue
+                                                
                                                 # Select division
                                                 if not self.select_dropdown_option("ContentPlaceHolder1_EdoMpoDiv_ddDivision", division_value):
                                                     self.track_failure(fare_type, region_name, municipality_name, division_name, year, month, "Failed to select division")
@@ -414,17 +721,11 @@ class CFETariffScraperSimplified:
                                                 self.track_failure(fare_type, region_name, municipality_name, division_name, year, month, str(e))
                                                 logger.error(f"Error processing {fare_type} division {division_name}: {e}")
                                                 continue
-                                            
-                                            # Go back to municipality selection
-                                            self.select_dropdown_option("ContentPlaceHolder1_EdoMpoDiv_ddMunicipio", municipality_value)
                                     
                                     except Exception as e:
                                         self.track_failure(fare_type, region_name, municipality_name, "N/A", year, month, str(e))
                                         logger.error(f"Error processing {fare_type} municipality {municipality_name}: {e}")
                                         continue
-                                    
-                                    # Go back to region selection
-                                    self.select_dropdown_option("ContentPlaceHolder1_EdoMpoDiv_ddEstado", region_value)
                             
                             except Exception as e:
                                 self.track_failure(fare_type, region_name, "N/A", "N/A", year, month, str(e))
@@ -434,8 +735,10 @@ class CFETariffScraperSimplified:
                     except Exception as e:
                         logger.error(f"Error processing {fare_type} period {year}-{month}: {e}")
                         continue
+                    finally:
+                        self.flush_failures()
             
-            logger.info(f"Scraping completed. Total records: Original={len(self.original_data)}, Translated={len(self.translated_data)}")
+            logger.info(f"Scraping completed. Total records: Original={self.original_count}")
             logger.info(f"Total failures tracked: {len(self.failed_extractions)}")
             
         except KeyboardInterrupt:
@@ -447,6 +750,139 @@ class CFETariffScraperSimplified:
                 self.driver.quit()
             except:
                 pass
+            self.flush_failures()
+            self.stop_translator()
+            logger.info(f"Translation completed. Total records: Translated={self.translated_count}")
+            self.save_json_data(self._trans_cache, self.translation_cache_file)
+            self.export_jsonl_as_json(self.original_data_file, self.original_json_file)
+            self.export_jsonl_as_json(self.translated_data_file, self.translated_json_file)
+
+def _scrape_shard(output_dir, extraction_dir, headless, fare_type, shard_index, num_shards):
+    """Scrape one fare type's region shard with its own Chrome instance"""
+    scraper = CFETariffScraperSimplified(
+        output_dir, headless=headless, shard_index=shard_index,
+        num_shards=num_shards, extraction_dir=extraction_dir, fare_types=[fare_type]
+    )
+    scraper.scrape_all_data()
+
+def pid_alive(pid):
+    """Check whether a process with this pid is still running"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _merge_shard_outputs(output_dir, shard_dirs):
+    """Append shard JSONL stores, failures and translations onto the consolidated files"""
+    for jsonl_name, json_name in CONSOLIDATED_FILES:
+        target = os.path.join(output_dir, jsonl_name)
+        json_target = os.path.join(output_dir, json_name)
+        CFETariffScraperSimplified.seed_jsonl_from_json(target, json_target)
+        with open(target, 'ab') as dst:
+            for shard_dir in shard_dirs:
+                shard_file = os.path.join(shard_dir, jsonl_name)
+                if os.path.exists(shard_file):
+                    with open(shard_file, 'rb') as src:
+                        shutil.copyfileobj(src, dst)
+        CFETariffScraperSimplified.export_jsonl_as_json(target, json_target)
+    
+    failures_target = os.path.join(output_dir, FAILURES_FILENAME)
+    failures = CFETariffScraperSimplified.load_existing_data(failures_target)
+    for shard_dir in shard_dirs:
+        failures.extend(CFETariffScraperSimplified.load_existing_data(os.path.join(shard_dir, FAILURES_FILENAME)))
+    CFETariffScraperSimplified.save_json_data(failures, failures_target)
+    
+    cache_file = os.path.join(output_dir, TRANSLATION_CACHE_FILENAME)
+    translations = CFETariffScraperSimplified.load_translation_cache(cache_file)
+    for shard_dir in shard_dirs:
+        translations.update(CFETariffScraperSimplified.load_translation_cache(
+            os.path.join(shard_dir, TRANSLATION_CACHE_FILENAME)
+        ))
+    CFETariffScraperSimplified.save_json_data(translations, cache_file)
+
+def merge_leftover_shards(output_dir):
+    """Merge shard outputs left behind by parallel runs that died before merging them"""
+    shards_parent = os.path.join(output_dir, "shards")
+    if not os.path.isdir(shards_parent):
+        return
+    for name in sorted(os.listdir(shards_parent)):
+        prefix, _, pid = name.partition("_")
+        if prefix != "run" or not pid.isdigit():
+            continue
+        # Another job may be scraping into the same output_dir; its shards are still live
+        if int(pid) != os.getpid() and pid_alive(int(pid)):
+            continue
+        # Renaming claims the directory, so two runs starting together never merge it twice
+        claimed = os.path.join(shards_parent, f"merging_{os.getpid()}_{pid}")
+        try:
+            os.rename(os.path.join(shards_parent, name), claimed)
+        except OSError:
+            continue
+        shard_dirs = [
+            os.path.join(claimed, shard) for shard in sorted(os.listdir(claimed))
+            if os.path.isdir(os.path.join(claimed, shard))
+        ]
+        _merge_shard_outputs(output_dir, shard_dirs)
+        shutil.rmtree(claimed, ignore_errors=True)
+        logger.info(f"Merged {len(shard_dirs)} leftover shard outputs from {name} into {output_dir}")
+
+def scrape_all_data_parallel(output_dir, headless=True, workers=4):
+    """Scrape with several Chrome processes splitting fare types and regions, then merge their outputs"""
+    merge_leftover_shards(output_dir)
+    # Keyed by pid so concurrent jobs on the same output_dir never share or delete each other's shards
+    shards_root = os.path.join(output_dir, "shards", f"run_{os.getpid()}")
+    # Fare types are independent, so each gets its own shards; the workers left over
+    # after one per fare type split each fare's regions further
+    region_shards = max(1, workers // len(FARE_URLS))
+    shards = [
+        (os.path.join(shards_root, f"{fare_type}_{i}"), fare_type, i)
+        for fare_type in FARE_URLS for i in range(region_shards)
+    ]
+    shard_dirs = [shard_dir for shard_dir, _, _ in shards]
+    # Shards cover disjoint fare/region pairs, so they can all write into the shared extraction tree
+    extraction_dir = os.path.join(output_dir, "extraction")
+    
+    # Every shard starts from the translations already known
+    cache_file = os.path.join(output_dir, TRANSLATION_CACHE_FILENAME)
+    for shard_dir in shard_dirs:
+        os.makedirs(shard_dir, exist_ok=True)
+        if os.path.exists(cache_file):
+            shutil.copy(cache_file, os.path.join(shard_dir, TRANSLATION_CACHE_FILENAME))
+    
+    try:
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            pool.starmap(
+                _scrape_shard,
+                [(shard_dir, extraction_dir, headless, fare_type, i, region_shards) for shard_dir, fare_type, i in shards]
+            )
+    finally:
+        # Merge whatever the shards produced, even if one of them failed; the shard
+        # stores are only removed once the merge has succeeded
+        _merge_shard_outputs(output_dir, shard_dirs)
+        shutil.rmtree(shards_root, ignore_errors=True)
+        logger.info(f"Merged {len(shards)} shard outputs into {output_dir}")
+
+def run_scrape(output_dir, headless=True, workers=1, error_conn=None):
+    """Run a full scrape; used as the target of the API's worker process
+
+    error_conn, if given, is the child end of a Pipe; the error of a failed
+    scrape is sent through it so the parent can report more than an exit code.
+    """
+    try:
+        if workers > 1:
+            scrape_all_data_parallel(output_dir, headless=headless, workers=workers)
+            return
+        merge_leftover_shards(output_dir)
+        scraper = CFETariffScraperSimplified(output_dir, headless=headless)
+        scraper.scrape_all_data()
+    except Exception as e:
+        if error_conn is not None:
+            # Kept short so the send never blocks on a full pipe before the parent reads it
+            error_conn.send(str(e)[:2000])
+        raise
 
 def main():
     """Run the scraper"""